@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 import sys
 import os
-from bs4 import BeautifulSoup
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+import lxml.html
+from lxml.cssselect import CSSSelector
+from lxml import etree as ET
 from datetime import datetime, timezone, timedelta
 from email.utils import parsedate_to_datetime
-import json
+import orjson
+import re
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 # -----------------------------
 # CONFIGURATION
@@ -21,6 +24,35 @@ MAX_ITEMS_PER_DAILY = 100
 BD_OFFSET = 6
 LOOKBACK_HOURS = 48
 LINK_RETENTION_DAYS = 7
+PUB_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S %z"
+
+# "Aug 08, 2026 08:50 PM", "08 Aug 2026 08:50:00", "2026-08-08 08:50:00"
+DATE_RE = re.compile(
+    r"(?:"
+    r"(?P<mon1>[A-Za-z]{3})\s+(?P<d1>\d{1,2}),\s+(?P<y1>\d{4})\s+(?P<h1>\d{1,2}):(?P<mi1>\d{1,2})\s+(?P<ap>[AaPp][Mm])"
+    r"|(?P<d2>\d{1,2})\s+(?P<mon2>[A-Za-z]{3})\s+(?P<y2>\d{4})\s+(?P<h2>\d{1,2}):(?P<mi2>\d{1,2}):(?P<s2>\d{1,2})"
+    r"|(?P<y3>\d{4})-(?P<m3>\d{1,2})-(?P<d3>\d{1,2})\s+(?P<h3>\d{1,2}):(?P<mi3>\d{1,2}):(?P<s3>\d{1,2})"
+    r")"
+)
+
+# Exact shape of PUB_DATE_FORMAT for a UTC datetime
+PUB_DATE_RE = re.compile(
+    r"(Mon|Tue|Wed|Thu|Fri|Sat|Sun), \d{2} "
+    r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) \d{4} \d{2}:\d{2}:\d{2} \+0000"
+)
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+# Compiled once, reused for every card
+SEL_CARD = CSSSelector("article.card.card-full.hover-a")
+SEL_LINK = CSSSelector("h2.card-title a[href]")
+SEL_DESC = CSSSelector("p.card-text")
+SEL_TIME = CSSSelector("time")
+SEL_IMG = CSSSelector("img")
+SEL_TEXT = ET.XPath(".//text()[not(ancestor::script or ancestor::style or ancestor::template)]")
 
 # -----------------------------
 # DATE PARSER
@@ -29,6 +61,15 @@ def parse_date_from_text(date_text):
     if not date_text:
         return datetime.now(timezone.utc)
 
+    dt = _parse_date_cached(date_text)
+    if dt is None:
+        return datetime.now(timezone.utc)
+    return dt
+
+# Many items share the same date string; misses return None so the
+# now() fallback is never cached
+@lru_cache(maxsize=4096)
+def _parse_date_cached(date_text):
     # Try email/pubDate style format
     try:
         dt = parsedate_to_datetime(date_text)
@@ -38,62 +79,88 @@ def parse_date_from_text(date_text):
     except Exception:
         pass
 
-    # Common formats
-    formats = [
-        "%b %d, %Y %I:%M %p",
-        "%d %b %Y %H:%M:%S",
-        "%Y-%m-%d %H:%M:%S",
-    ]
+    # Common formats, matched in one pass
+    m = DATE_RE.fullmatch(date_text)
+    if m:
+        return _date_from_match(m)
 
-    for fmt in formats:
-        try:
-            dt = datetime.strptime(date_text, fmt)
-            return dt.replace(tzinfo=timezone.utc)
-        except Exception:
-            continue
+    return None
 
-    return datetime.now(timezone.utc)
+def _date_from_match(m):
+    g = m.groupdict()
+    try:
+        if g["y1"]:
+            hour = int(g["h1"])
+            if not 1 <= hour <= 12:
+                return None
+            hour = hour % 12 + (12 if g["ap"].lower() == "pm" else 0)
+            return datetime(int(g["y1"]), MONTHS[g["mon1"].lower()], int(g["d1"]),
+                            hour, int(g["mi1"]), tzinfo=timezone.utc)
+        if g["y2"]:
+            return datetime(int(g["y2"]), MONTHS[g["mon2"].lower()], int(g["d2"]),
+                            int(g["h2"]), int(g["mi2"]), int(g["s2"]), tzinfo=timezone.utc)
+        return datetime(int(g["y3"]), int(g["m3"]), int(g["d3"]),
+                        int(g["h3"]), int(g["mi3"]), int(g["s3"]), tzinfo=timezone.utc)
+    except (KeyError, ValueError):
+        return None
 
 # -----------------------------
 # LOAD EXISTING XML ITEMS
 # -----------------------------
+def item_to_dict(item):
+    try:
+        t = item.find("title")
+        title = (t.text or "").strip() if t is not None else ""
+        lk = item.find("link")
+        link = (lk.text or "").strip() if lk is not None else ""
+        d = item.find("description")
+        desc = (d.text or "") if d is not None else ""
+
+        p = item.find("pubDate")
+        pub_str = ""
+        pub = _parse_date_cached(p.text) if p is not None and p.text else None
+        if pub is None:
+            pub = datetime.now(timezone.utc)
+        else:
+            # Text already in PUB_DATE_FORMAT (what this script writes) is reused as-is
+            m = PUB_DATE_RE.fullmatch(p.text)
+            if m and m.group(1) == WEEKDAYS[pub.weekday()]:
+                pub_str = p.text
+
+        img = ""
+        enc = item.find("enclosure")
+        if enc is not None and enc.get("url"):
+            img = enc.get("url")
+
+        return {
+            "title": title,
+            "link": link,
+            "description": desc,
+            "pubDate": pub,
+            "pubDate_str": pub_str,
+            "img": img
+        }
+    except Exception:
+        return None
+
 def load_existing(file_path):
     if not os.path.exists(file_path):
         return []
 
+    items = []
     try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
+        for _, item in ET.iterparse(file_path, events=("end",), tag="item"):
+            entry = item_to_dict(item)
+            if entry is not None:
+                items.append(entry)
+
+            # Items are read once; free them as we go
+            item.clear(keep_tail=True)
+            while item.getprevious() is not None:
+                del item.getparent()[0]
     except Exception:
         return []
 
-    items = []
-    for item in root.findall(".//item"):
-        try:
-            title = (item.find("title").text or "").strip() if item.find("title") is not None else ""
-            link = (item.find("link").text or "").strip() if item.find("link") is not None else ""
-            desc = (item.find("description").text or "") if item.find("description") is not None else ""
-
-            if item.find("pubDate") is not None and item.find("pubDate").text:
-                pub = parse_date_from_text(item.find("pubDate").text)
-            else:
-                pub = datetime.now(timezone.utc)
-
-            img = ""
-            enc = item.find("enclosure")
-            if enc is not None and enc.get("url"):
-                img = enc.get("url")
-
-            items.append({
-                "title": title,
-                "link": link,
-                "description": desc,
-                "pubDate": pub,
-                "img": img
-            })
-        except Exception:
-            continue
-
     return items
 
 # -----------------------------
@@ -115,18 +182,18 @@ def write_rss(items, file_path, title="Feed"):
         ET.SubElement(node, "description").text = item.get("description", "")
 
         pub = item.get("pubDate")
-        if isinstance(pub, datetime):
-            ET.SubElement(node, "pubDate").text = pub.strftime("%a, %d %b %Y %H:%M:%S %z")
+        if item.get("pubDate_str"):
+            ET.SubElement(node, "pubDate").text = item["pubDate_str"]
+        elif isinstance(pub, datetime):
+            ET.SubElement(node, "pubDate").text = pub.strftime(PUB_DATE_FORMAT)
         else:
             ET.SubElement(node, "pubDate").text = str(pub)
 
         if item.get("img"):
             ET.SubElement(node, "enclosure", url=item["img"], type="image/jpeg")
 
-    xml_str = minidom.parseString(ET.tostring(rss)).toprettyxml(indent="  ")
-
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(xml_str)
+    tree = ET.ElementTree(rss)
+    tree.write(file_path, encoding="utf-8", xml_declaration=True, pretty_print=True)
 
 # -----------------------------
 # LAST SEEN
@@ -136,8 +203,8 @@ def load_last_seen():
         return {"last_seen": None}
 
     try:
-        with open(LAST_SEEN_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(LAST_SEEN_FILE, "rb") as f:
+            data = orjson.loads(f.read())
             last_seen_str = data.get("last_seen")
             if last_seen_str:
                 return {"last_seen": datetime.fromisoformat(last_seen_str)}
@@ -147,49 +214,60 @@ def load_last_seen():
     return {"last_seen": None}
 
 def save_last_seen(last_dt):
-    with open(LAST_SEEN_FILE, "w", encoding="utf-8") as f:
-        json.dump({
-            "last_seen": last_dt.isoformat(),
-            "last_run": datetime.now(timezone.utc).isoformat()
-        }, f, indent=2)
+    # orjson writes datetimes as ISO 8601 itself
+    with open(LAST_SEEN_FILE, "wb") as f:
+        f.write(orjson.dumps({
+            "last_seen": last_dt,
+            "last_run": datetime.now(timezone.utc)
+        }, option=orjson.OPT_INDENT_2))
 
 # -----------------------------
 # SCRAPE HTML FILE
 # -----------------------------
+def node_text(node):
+    # Same result as BeautifulSoup's get_text(strip=True), which also
+    # skips comments and script/style/template text
+    return "".join(s.strip() for s in SEL_TEXT(node))
+
+def first_match(selector, node):
+    matches = selector(node)
+    return matches[0] if matches else None
+
 def scrape_articles():
     if not os.path.exists(HTML_FILE):
         print(f"HTML file '{HTML_FILE}' not found")
         return []
 
-    with open(HTML_FILE, "r", encoding="utf-8") as f:
-        soup = BeautifulSoup(f.read(), "html.parser")
+    # libxml2 reads the file itself; no Python-side copy of the page.
+    # fetch.py writes UTF-8, so don't rely on the page's <meta charset>
+    doc = lxml.html.parse(HTML_FILE, lxml.html.HTMLParser(encoding="utf-8")).getroot()
 
     articles = []
 
     # Updated selector to match the HTML structure
-    for card in soup.select("article.card.card-full.hover-a"):
-        link_tag = card.select_one("h2.card-title a[href]")
-        if not link_tag:
+    for card in SEL_CARD(doc):
+        link_tag = first_match(SEL_LINK, card)
+        if link_tag is None:
             continue
 
         url = link_tag.get("href", "")
         if not url:
             continue
 
-        title = link_tag.get_text(strip=True)
+        title = node_text(link_tag)
         if not title:
             continue
 
-        desc_tag = card.select_one("p.card-text")
-        desc = desc_tag.get_text(strip=True) if desc_tag else ""
+        desc_tag = first_match(SEL_DESC, card)
+        desc = node_text(desc_tag) if desc_tag is not None else ""
 
-        time_tag = card.select_one("time")
-        pub_text = time_tag.get_text(strip=True) if time_tag else ""
+        time_tag = first_match(SEL_TIME, card)
+        pub_text = node_text(time_tag) if time_tag is not None else ""
         pub_date = parse_date_from_text(pub_text)
 
-        img_tag = card.select_one("img")
+        img_tag = first_match(SEL_IMG, card)
         img = ""
-        if img_tag:
+        if img_tag is not None:
             img = img_tag.get("data-src", "") or img_tag.get("src", "")
 
         articles.append({
@@ -197,6 +275,7 @@ def scrape_articles():
             "title": title,
             "desc": desc,
             "pub": pub_date,
+            "pub_str": pub_date.strftime(PUB_DATE_FORMAT),
             "img": img
         })
 
@@ -206,13 +285,23 @@ def scrape_articles():
 # -----------------------------
 # UPDATE MAIN XML
 # -----------------------------
+def parse_main_xml():
+    # Fresh parser per call: lxml parsers are not thread-safe. Drop
+    # whitespace-only text so pretty_print can re-indent on write
+    return ET.parse(XML_FILE, ET.XMLParser(remove_blank_text=True))
+
 def update_main_xml():
     print("[Updating articles.xml]")
 
-    new_articles = scrape_articles()
+    # Parse the master file in the background while the page is scraped;
+    # libxml2 releases the GIL while it parses
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        xml_future = pool.submit(parse_main_xml) if os.path.exists(XML_FILE) else None
+        new_articles = scrape_articles()
+
     if not new_articles:
         print("No articles found")
-        return
+        return None
 
     # DEBUG: Print first few scraped articles
     print(f"\n📰 First 3 scraped articles:")
@@ -222,12 +311,12 @@ def update_main_xml():
         print(f"    Date: {art['pub']}")
 
     # Load or create root
-    if os.path.exists(XML_FILE):
+    if xml_future is not None:
         try:
-            tree = ET.parse(XML_FILE)
+            tree = xml_future.result()
             root = tree.getroot()
             print(f"\n✓ Loaded existing {XML_FILE}")
-        except ET.ParseError:
+        except ET.XMLSyntaxError:
             print(f"\n⚠ Could not parse {XML_FILE}, creating new file")
             root = ET.Element("rss", version="2.0")
     else:
@@ -241,8 +330,9 @@ def update_main_xml():
         ET.SubElement(channel, "link").text = "https://www.newagebd.net"
         ET.SubElement(channel, "description").text = "Latest news articles"
 
+    items = channel.findall("item")
     existing_links = set()
-    for item in channel.findall("item"):
+    for item in items:
         lk = item.find("link")
         if lk is not None and lk.text:
             existing_links.add(lk.text.strip())
@@ -263,7 +353,7 @@ def update_main_xml():
         ET.SubElement(node, "title").text = art["title"]
         ET.SubElement(node, "link").text = art["url"]
         ET.SubElement(node, "description").text = art["desc"]
-        ET.SubElement(node, "pubDate").text = art["pub"].strftime("%a, %d %b %Y %H:%M:%S %z")
+        ET.SubElement(node, "pubDate").text = art["pub_str"]
 
         if art["img"]:
             ET.SubElement(node, "enclosure", url=art["img"], type="image/jpeg")
@@ -283,28 +373,36 @@ def update_main_xml():
         else:
             break
 
-    for i, nd in enumerate(new_nodes):
-        channel.insert(insert_pos + i, nd)
+    channel[insert_pos:insert_pos] = new_nodes
 
-    # Trim
-    all_items = channel.findall("item")
+    # Trim (new nodes now sit ahead of every existing item)
+    all_items = new_nodes + items
     if len(all_items) > MAX_ITEMS:
         to_remove = len(all_items) - MAX_ITEMS
-        for old in all_items[-to_remove:]:
-            channel.remove(old)
+        start = channel.index(all_items[MAX_ITEMS])
+        if len(channel) - start == to_remove:
+            # Old items are the tail of the channel; drop them in one slice
+            del channel[start:]
+        else:
+            for old in all_items[MAX_ITEMS:]:
+                channel.remove(old)
         print(f"✂️  Removed {to_remove} old articles (keeping {MAX_ITEMS} max)")
+        all_items = all_items[:MAX_ITEMS]
 
     # Save XML
     tree = ET.ElementTree(root)
-    ET.indent(tree, space="  ", level=0)
-    tree.write(XML_FILE, encoding="utf-8", xml_declaration=True)
+    tree.write(XML_FILE, encoding="utf-8", xml_declaration=True, pretty_print=True)
 
     print(f"✓ Saved {XML_FILE}")
 
+    # Hand the saved <item> elements to update_daily() so it can skip
+    # re-reading the file; it converts them only if it runs
+    return all_items
+
 # -----------------------------
 # UPDATE DAILY FEED
 # -----------------------------
-def update_daily():
+def update_daily(items=None):
     print("\n[Updating daily feed]")
 
     last = load_last_seen()
@@ -317,22 +415,19 @@ def update_daily():
         cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
         print(f"No last seen, using 24h cutoff: {cutoff}")
 
-    master = load_existing(XML_FILE)
-    print(f"Loaded {len(master)} articles from {XML_FILE}")
-
-    fresh = []
-    seen = set()
+    if items is not None:
+        master = [d for d in (item_to_dict(i) for i in items) if d is not None]
+        print(f"Using {len(master)} articles from this run's {XML_FILE}")
+    else:
+        master = load_existing(XML_FILE)
+        print(f"Loaded {len(master)} articles from {XML_FILE}")
 
+    # Dedup by link, keeping the first fresh occurrence in feed order
+    by_link = {}
     for item in master:
-        link = item["link"]
-        pub = item["pubDate"]
-
-        if link in seen:
-            continue
-
-        if pub > cutoff:
-            fresh.append(item)
-            seen.add(link)
+        if item["pubDate"] > cutoff:
+            by_link.setdefault(item["link"], item)
+    fresh = list(by_link.values())
 
     print(f"Found {len(fresh)} fresh articles since cutoff")
 
@@ -398,8 +493,8 @@ if __name__ == "__main__":
         files_created = [XML_FILE]
 
     else:
-        update_main_xml()
-        daily_files = update_daily()
+        main_items = update_main_xml()
+        daily_files = update_daily(main_items)
         files_created = [XML_FILE] + daily_files + [LAST_SEEN_FILE]
 
     print("\n" + "=" * 60)